@@ -3,27 +3,59 @@
 # @details Could probably also be used for pool billard.
 
 import pygame
-import json
+import numpy as np
 import math
 import os
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Callable, Set, Optional
+
+# Numba is optional. Without it, the physics kernels below run as plain Python.
+try:
+    from numba import njit
+    HAS_NUMBA: bool = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# orjson is optional and parses course files faster than the json module.
+try:
+    import orjson
+    _json_loads: Callable[[Any], Any] = orjson.loads
+    _json_read_mode: str = "rb"
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_read_mode = "r"
 
 # Constants
 SCREEN_WIDTH: int = 800
 SCREEN_HEIGHT: int = 600
 FPS: int = 60
+PHYS_DT: float = 1.0 / 240.0  # fixed physics time step, independent of the frame rate
+MAX_PHYS_STEPS: int = 16  # maximum physics steps per frame, to keep up after long frames without spiraling
 
 COLOR_AIMLINE: Tuple[int, int, int] = (255, 255, 0)
+COLOR_HUD: Tuple[int, int, int] = (255, 255, 255)
 SHOOT_STRENGTH: float = 20.0
 MAX_SHOOT_STRENGTH: float = 600.0  # maximum multiplier for the shot
 
+BROAD_PHASE_MIN_PRIMITIVES: int = 32  # below this, collision primitives are tested brute force
+SPATIAL_HASH_MIN_CELL_SIZE: float = 32.0
+HOLE_BATCH_MIN: int = 32  # from this many holes on, they are tested in one NumPy pass
+
+# Axis-aligned bounding box as (min_x, min_y, max_x, max_y).
+AABB = Tuple[float, float, float, float]
+
 ## @brief Load course data from a JSON file.
 #  @param filename The path to the JSON file.
 #  @return A dictionary containing the course data.
 def load_course_data(filename: str) -> Dict[str, Any]:
     if os.path.exists(filename):
-        with open(filename, "r") as f:
-            return json.load(f)
+        with open(filename, _json_read_mode) as f:
+            return _json_loads(f.read())
     else:
         return \
 {
@@ -54,43 +86,184 @@ def load_course_data(filename: str) -> Dict[str, Any]:
     "ball_radius": 8.0
 }
 
-## @brief Get the nearest point on a line segment from a given point.
-#  @param p The point to project.
-#  @param a The start point of the segment.
-#  @param b The end point of the segment.
-#  @return The nearest point on the segment from p.
-def get_nearest_point_on_segment(p: pygame.Vector2, a: pygame.Vector2, b: pygame.Vector2) -> pygame.Vector2:
-    ab: pygame.Vector2 = b - a
-    if ab.length_squared() == 0:
-        return a
-    t: float = (p - a).dot(ab) / ab.dot(ab)
-    t = max(0, min(1, t))
-    return a + ab * t
-
-## @brief Handle collision between the ball and the edges of a polygon.
+## @brief Render multi-line text into a single surface.
+#  @details Font.render() does not handle line breaks, so each line is rendered separately.
+#  @param font The font to render with.
+#  @param text The text, lines separated by '\n'.
+#  @param color The text color.
+#  @return A transparent surface containing all lines.
+def render_text_lines(font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+    lines: List[pygame.Surface] = [font.render(line, True, color) for line in text.split("\n")]
+    line_height: int = font.get_linesize()
+    surface: pygame.Surface = pygame.Surface((max(line.get_width() for line in lines), line_height * len(lines)), pygame.SRCALPHA)
+    for i, line in enumerate(lines):
+        surface.blit(line, (0, i * line_height))
+    return surface
+
+## @brief Reflect a velocity off a surface.
+#  @param vx The x velocity.
+#  @param vy The y velocity.
+#  @param nx The x component of the surface normal, must be normalized.
+#  @param ny The y component of the surface normal, must be normalized.
+#  @return The reflected velocity as (vx, vy).
+def reflect_scalar(vx: float, vy: float, nx: float, ny: float) -> Tuple[float, float]:
+    d: float = 2.0 * (vx * nx + vy * ny)
+    return vx - d * nx, vy - d * ny
+
+# Compiled variant for use inside the physics kernels.
+_reflect_scalar_jit: Callable = njit(cache=True, fastmath=True)(reflect_scalar)
+
+## @brief Integrate the ball's position and apply friction for one time step.
+#  @param pos_x The ball's x position.
+#  @param pos_y The ball's y position.
+#  @param vx The ball's x velocity.
+#  @param vy The ball's y velocity.
+#  @param dt The time elapsed since the last update.
+#  @param friction The friction coefficient.
+#  @return The new position and velocity as (x, y, vx, vy).
+@njit(cache=True, fastmath=True)
+def step_ball(pos_x: float, pos_y: float, vx: float, vy: float, dt: float, friction: float) -> Tuple[float, float, float, float]:
+    pos_x += vx * dt
+    pos_y += vy * dt
+    decay: float = 1.0 - (1.0 - friction) * dt
+    vx *= decay
+    vy *= decay
+    if vx * vx + vy * vy < 0.01:
+        vx = 0.0
+        vy = 0.0
+    return pos_x, pos_y, vx, vy
+
+## @brief Compiled collision test of the ball against a set of polygon edges.
+#  @details Scalar loop over the edge arrays, the closest colliding edge wins.
+#  @param pos_x The ball's x position.
+#  @param pos_y The ball's y position.
+#  @param vx The ball's x velocity.
+#  @param vy The ball's y velocity.
+#  @param p1 Edge start points, shape (N, 2).
+#  @param edge Edge vectors, shape (N, 2).
+#  @param inv_edot Inverse squared edge lengths, shape (N,).
+#  @param r The ball's radius.
+#  @param damping The damping factor to apply on collision.
+#  @return (collided, x, y, vx, vy) with the ball's new position and velocity.
+@njit(cache=True, fastmath=True)
+def collide_polygon(pos_x: float, pos_y: float, vx: float, vy: float, p1: np.ndarray, edge: np.ndarray, inv_edot: np.ndarray, r: float, damping: float) -> Tuple[bool, float, float, float, float]:
+    best_d2: float = r * r
+    best_i: int = -1
+    near_x: float = 0.0
+    near_y: float = 0.0
+    for i in range(p1.shape[0]):
+        ex: float = edge[i, 0]
+        ey: float = edge[i, 1]
+        t: float = ((pos_x - p1[i, 0]) * ex + (pos_y - p1[i, 1]) * ey) * inv_edot[i]
+        t = min(1.0, max(0.0, t))
+        nx: float = p1[i, 0] + ex * t
+        ny: float = p1[i, 1] + ey * t
+        d2: float = (pos_x - nx) * (pos_x - nx) + (pos_y - ny) * (pos_y - ny)
+        if 0.0 < d2 < best_d2:
+            best_d2 = d2
+            best_i = i
+            near_x = nx
+            near_y = ny
+    if best_i < 0:
+        return False, pos_x, pos_y, vx, vy
+    dist: float = math.sqrt(best_d2)
+    normal_x: float = (pos_x - near_x) / dist
+    normal_y: float = (pos_y - near_y) / dist
+    # Move the ball out of the collision zone, reflect and damp its velocity.
+    vx, vy = _reflect_scalar_jit(vx, vy, normal_x, normal_y)
+    return True, near_x + normal_x * r, near_y + normal_y * r, vx * damping, vy * damping
+
+## @brief Handle collision between the ball and the edges of the course polygon.
+#  @details Uses the compiled loop over all edges if Numba is available. Otherwise,
+#           the edges near the ball are tested in one vectorized NumPy pass over the
+#           course's precomputed edge arrays. The edge closest to the ball wins.
 #  @param ball The ball object.
-#  @param polygon_points A list of points defining the polygon.
+#  @param course The course whose polygon edges are tested.
 #  @param damping The damping factor to apply on collision.
 #  @return True if a collision occurred, False otherwise.
-def handle_polygon_collision(ball: "Ball", polygon_points: List[pygame.Vector2], damping: float) -> bool:
-    for i in range(len(polygon_points)):
-        j: int = (i + 1) % len(polygon_points)
-        p1: pygame.Vector2 = polygon_points[i]
-        p2: pygame.Vector2 = polygon_points[j]
-        nearest: pygame.Vector2 = get_nearest_point_on_segment(ball.pos, p1, p2)
-        dist: float = (ball.pos - nearest).length()
-        if dist < ball.radius:
-            if dist == 0:
-                continue
-            normal: pygame.Vector2 = (ball.pos - nearest).normalize()
-            # Move the ball out of the collision zone.
-            ball.pos = nearest + normal * ball.radius
-            # Reflect the ball's velocity off the edge.
-            ball.velocity = ball.velocity.reflect(normal)
-            # Apply damping factor.
-            ball.velocity *= damping
-            return True
-    return False
+def handle_polygon_collision(ball: "Ball", course: "Course", damping: float) -> bool:
+    if HAS_NUMBA:
+        collided, x, y, vx, vy = collide_polygon(ball.x, ball.y, ball.vx, ball.vy, course._p1, course._edge, course._inv_edge_dot, ball.radius, damping)
+        if collided:
+            ball.x, ball.y, ball.vx, ball.vy = x, y, vx, vy
+        return collided
+
+    p1, edge, inv_edge_dot = course.edges_near(ball)
+    if len(p1) == 0:
+        return False
+
+    ball_pos: np.ndarray = np.array((ball.x, ball.y))
+    ap: np.ndarray = ball_pos - p1
+    t: np.ndarray = np.clip(np.einsum("ij,ij->i", ap, edge) * inv_edge_dot, 0.0, 1.0)
+    nearest: np.ndarray = p1 + t[:, None] * edge
+    diff: np.ndarray = ball_pos - nearest
+    d2: np.ndarray = np.einsum("ij,ij->i", diff, diff)
+    # Ignore edges the ball center lies exactly on, there is no normal to push along.
+    d2[d2 == 0.0] = np.inf
+    i: int = int(np.argmin(d2))
+    if d2[i] >= ball.radius * ball.radius:
+        return False
+    dist: float = math.sqrt(d2[i])
+    nx: float = float(diff[i][0]) / dist
+    ny: float = float(diff[i][1]) / dist
+    # Move the ball out of the collision zone.
+    ball.x = float(nearest[i][0]) + nx * ball.radius
+    ball.y = float(nearest[i][1]) + ny * ball.radius
+    # Reflect the ball's velocity off the edge.
+    ball.vx, ball.vy = reflect_scalar(ball.vx, ball.vy, nx, ny)
+    # Apply damping factor.
+    ball.vx *= damping
+    ball.vy *= damping
+    return True
+
+## @brief Uniform grid hashing axis-aligned bounding boxes into cells, for broad-phase collision culling.
+class SpatialHashGrid:
+    ## @brief Construct a new SpatialHashGrid object.
+    #  @param cell_size The edge length of a grid cell.
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size: float = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+
+    ## @brief Get the range of cells covered by a bounding box.
+    #  @param aabb The bounding box.
+    #  @return The inclusive cell index range as (min_cx, min_cy, max_cx, max_cy).
+    def _cell_range(self, aabb: AABB) -> Tuple[int, int, int, int]:
+        return (int(aabb[0] // self.cell_size), int(aabb[1] // self.cell_size),
+                int(aabb[2] // self.cell_size), int(aabb[3] // self.cell_size))
+
+    ## @brief Insert a primitive into every cell its bounding box overlaps.
+    #  @param item_id The id of the primitive.
+    #  @param aabb The bounding box of the primitive.
+    def insert(self, item_id: int, aabb: AABB) -> None:
+        min_cx, min_cy, max_cx, max_cy = self._cell_range(aabb)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                self.cells.setdefault((cx, cy), []).append(item_id)
+
+    ## @brief Get the primitives whose cells overlap a bounding box.
+    #  @param aabb The bounding box to query.
+    #  @return The ids of all primitives sharing a cell with the bounding box.
+    def query(self, aabb: AABB) -> Set[int]:
+        min_cx, min_cy, max_cx, max_cy = self._cell_range(aabb)
+        result: Set[int] = set()
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                ids: Optional[List[int]] = self.cells.get((cx, cy))
+                if ids:
+                    result.update(ids)
+        return result
+
+    ## @brief Build a grid over a list of bounding boxes.
+    #  @details The cell size is twice the average box extent, but at least SPATIAL_HASH_MIN_CELL_SIZE.
+    #  @param aabbs The bounding boxes, their list index is used as id.
+    #  @return The new grid.
+    @staticmethod
+    def from_aabbs(aabbs: List[AABB]) -> "SpatialHashGrid":
+        extent: float = sum(max(b[2] - b[0], b[3] - b[1]) for b in aabbs) / max(len(aabbs), 1)
+        grid: SpatialHashGrid = SpatialHashGrid(max(2.0 * extent, SPATIAL_HASH_MIN_CELL_SIZE))
+        for i, aabb in enumerate(aabbs):
+            grid.insert(i, aabb)
+        return grid
 
 ## @brief Class representing the ball in the game.
 class Ball:
@@ -100,26 +273,53 @@ class Ball:
     #  @param radius The radius of the ball.
     #  @param color The color of the ball.
     def __init__(self, pos: Tuple[float, float], friction: float = 0.01, radius: float = 8.0, color: Tuple[int, int, int] = (255, 255, 255)) -> None:
-        self.pos: pygame.Vector2 = pygame.Vector2(pos)
-        self.velocity: pygame.Vector2 = pygame.Vector2(0, 0)
+        # Position, velocity and previous position are plain floats, to avoid Vector2 temporaries in the physics code.
+        # The previous position (px, py) always exists, collision code relies on it.
+        self.x: float = float(pos[0])
+        self.y: float = float(pos[1])
+        self.vx: float = 0.0
+        self.vy: float = 0.0
         self.radius: float = radius
         self.friction: float = friction
         self.color: Tuple[int, int, int] = color
-        self.prev_pos: pygame.Vector2 = self.pos.copy()
+        self.px: float = self.x
+        self.py: float = self.y
+        self._sprite: Optional[pygame.Surface] = None
 
     ## @brief Update the ball's position and velocity.
     #  @param dt The time elapsed since the last update.
     def update(self, dt: float) -> None:
-        self.prev_pos = self.pos.copy()  # Store the previous position.
-        self.pos += self.velocity * dt
-        self.velocity *= 1.0 - (1.0 - self.friction) * dt
-        if self.velocity.length() < 0.1:
-            self.velocity = pygame.Vector2(0, 0)
+        self.px, self.py = self.x, self.y  # Store the previous position.
+        self.x, self.y, self.vx, self.vy = step_ball(self.x, self.y, self.vx, self.vy, dt, self.friction)
+
+    ## @brief Check if the ball has come to rest.
+    #  @return True if the ball is not moving, False otherwise.
+    def at_rest(self) -> bool:
+        return self.vx == 0.0 and self.vy == 0.0
+
+    ## @brief Render the ball into a transparent sprite.
+    #  @return The sprite surface.
+    def _render_sprite(self) -> pygame.Surface:
+        r: int = int(self.radius)
+        sprite: pygame.Surface = pygame.Surface((2 * r + 2, 2 * r + 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, self.color, (r + 1, r + 1), r)
+        return sprite.convert_alpha()
 
     ## @brief Draw the ball on the given screen.
+    #  @details The ball is rendered into a sprite once, which is blitted afterwards.
     #  @param screen The pygame Surface to draw on.
-    def draw(self, screen: pygame.Surface) -> None:
-        pygame.draw.circle(screen, self.color, (int(self.pos.x), int(self.pos.y)), int(self.radius))
+    #  @return The screen area that was drawn to.
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        if self._sprite is None:
+            self._sprite = self._render_sprite()
+        offset: int = int(self.radius) + 1
+        return screen.blit(self._sprite, (int(self.x) - offset, int(self.y) - offset))
+
+    ## @brief Get the bounding box of the ball's center travel during the last update.
+    #  @return The bounding box spanning the previous and the current position.
+    def travel_aabb(self) -> AABB:
+        return (min(self.px, self.x), min(self.py, self.y),
+                max(self.px, self.x), max(self.py, self.y))
 
 ## @brief Base class for obstacles.
 class Obstacle:
@@ -134,6 +334,16 @@ class Obstacle:
     def collide(self, ball: Ball, dt: float) -> None:
         raise NotImplementedError("Collision method not implemented!")
 
+    ## @brief Get the bounding box of the obstacle.
+    #  @return The bounding box.
+    def aabb(self) -> AABB:
+        raise NotImplementedError("Bounding box method not implemented!")
+
+    ## @brief Precompute per-ball collision data.
+    #  @param ball The ball object.
+    def bind_ball(self, ball: Ball) -> None:
+        pass
+
 ## @brief Class representing a circular obstacle.
 class CircleObstacle(Obstacle):
     ## @brief Construct a new CircleObstacle object.
@@ -142,7 +352,8 @@ class CircleObstacle(Obstacle):
     #  @param damping The damping factor to apply on collision.
     #  @param color The color of the circle.
     def __init__(self, pos: Tuple[float, float], radius: float, damping: float, color: Tuple[int, int, int]) -> None:
-        self.pos: pygame.Vector2 = pygame.Vector2(pos)
+        self.x: float = float(pos[0])
+        self.y: float = float(pos[1])
         self.radius: float = radius
         self.damping: float = damping
         self.color: Tuple[int, int, int] = color
@@ -150,33 +361,57 @@ class CircleObstacle(Obstacle):
     ## @brief Draw the circular obstacle.
     #  @param screen The pygame Surface to draw on.
     def draw(self, screen: pygame.Surface) -> None:
-        pygame.draw.circle(screen, self.color, (int(self.pos.x), int(self.pos.y)), int(self.radius), 2)
+        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.radius), 2)
+
+    ## @brief Get the bounding box of the circular obstacle.
+    #  @return The bounding box.
+    def aabb(self) -> AABB:
+        return (self.x - self.radius, self.y - self.radius, self.x + self.radius, self.y + self.radius)
+
+    ## @brief Precompute the combined radius of obstacle and ball.
+    #  @param ball The ball object.
+    def bind_ball(self, ball: Ball) -> None:
+        self._r_sum: float = self.radius + ball.radius
+        self._r_sum_sq: float = self._r_sum * self._r_sum
 
     ## @brief Handle collision between the ball and the circular obstacle.
+    #  @details The ball must have been bound with bind_ball() before.
     #  @param ball The ball object.
     #  @param dt The time elapsed since the last update.
     def collide(self, ball: Ball, dt: float) -> None:
         # Determine start and end of ball's travel this frame.
-        start: pygame.Vector2 = ball.prev_pos if hasattr(ball, 'prev_pos') else ball.pos - ball.velocity * dt
-        end: pygame.Vector2 = ball.pos
-        d: pygame.Vector2 = end - start
+        start_x: float = ball.px
+        start_y: float = ball.py
+        dx: float = ball.x - start_x
+        dy: float = ball.y - start_y
+
+        # Broad phase: skip if the obstacle center is outside the travel's bounding box grown by the combined radius.
+        if (self.x < min(start_x, ball.x) - self._r_sum or self.x > max(start_x, ball.x) + self._r_sum or
+                self.y < min(start_y, ball.y) - self._r_sum or self.y > max(start_y, ball.y) + self._r_sum):
+            return
+
+        a: float = dx * dx + dy * dy
 
         # If the ball hasn't moved much, do a simple static check.
-        if d.length_squared() < 1e-8:
-            if (ball.pos - self.pos).length() < self.radius + ball.radius:
-                if (ball.pos - self.pos).length() > 0:
-                    normal: pygame.Vector2 = (ball.pos - self.pos).normalize()
-                    ball.pos = self.pos + normal * (self.radius + ball.radius)
-                    ball.velocity = ball.velocity.reflect(normal) * self.damping
+        if a < 1e-8:
+            ox: float = ball.x - self.x
+            oy: float = ball.y - self.y
+            dist_sq: float = ox * ox + oy * oy
+            if 0 < dist_sq < self._r_sum_sq:
+                dist: float = math.sqrt(dist_sq)
+                nx: float = ox / dist
+                ny: float = oy / dist
+                ball.x = self.x + nx * self._r_sum
+                ball.y = self.y + ny * self._r_sum
+                ball.vx, ball.vy = reflect_scalar(ball.vx, ball.vy, nx, ny)
+                ball.vx *= self.damping
+                ball.vy *= self.damping
             return
 
-        f: pygame.Vector2 = start - self.pos
-        # Combined radius: obstacle radius + ball radius.
-        r: float = self.radius + ball.radius
-
-        a: float = d.dot(d)
-        b: float = 2 * f.dot(d)
-        c: float = f.dot(f) - r * r
+        fx: float = start_x - self.x
+        fy: float = start_y - self.y
+        b: float = 2 * (fx * dx + fy * dy)
+        c: float = fx * fx + fy * fy - self._r_sum_sq
 
         discriminant: float = b * b - 4 * a * c
         if discriminant < 0:
@@ -193,15 +428,21 @@ class CircleObstacle(Obstacle):
             t = t2
 
         if 0 <= t <= 1:
-            # The collision point along the ball's travel.
-            collision_point: pygame.Vector2 = start + d * t
+            # The collision point along the ball's travel, relative to the obstacle center.
+            cx: float = fx + dx * t
+            cy: float = fy + dy * t
             # Calculate the collision normal from the obstacle center.
-            normal: pygame.Vector2 = (collision_point - self.pos).normalize()
+            length: float = math.hypot(cx, cy)
+            nx = cx / length
+            ny = cy / length
             # Reposition the ball so its center is at a distance of (obstacle.radius + ball.radius).
             # A small epsilon factor (1.0001) is applied to avoid sticking.
-            ball.pos = self.pos + normal * (self.radius + ball.radius) * 1.0001
+            ball.x = self.x + nx * self._r_sum * 1.0001
+            ball.y = self.y + ny * self._r_sum * 1.0001
             # Reflect velocity and apply damping.
-            ball.velocity = ball.velocity.reflect(normal) * self.damping
+            ball.vx, ball.vy = reflect_scalar(ball.vx, ball.vy, nx, ny)
+            ball.vx *= self.damping
+            ball.vy *= self.damping
 
 ## @brief Class representing a polygonal obstacle.
 class PolygonObstacle(Obstacle):
@@ -215,6 +456,12 @@ class PolygonObstacle(Obstacle):
     def draw(self, screen: pygame.Surface) -> None:
         pygame.draw.polygon(screen, (0, 200, 0), [(p.x, p.y) for p in self.points], 2)
 
+    ## @brief Get the bounding box of the polygon obstacle.
+    #  @return The bounding box.
+    def aabb(self) -> AABB:
+        return (min(p.x for p in self.points), min(p.y for p in self.points),
+                max(p.x for p in self.points), max(p.y for p in self.points))
+
     ## @brief Handle collision between the ball and the polygon obstacle.
     #  @param ball The ball object.
     #  @param dt The time elapsed since the last update.
@@ -230,6 +477,7 @@ class Hole:
     def __init__(self, pos: Tuple[float, float], radius: float, color: Tuple[int, int, int]) -> None:
         self.pos: pygame.Vector2 = pygame.Vector2(pos)
         self.radius: float = radius
+        self.r2: float = radius * radius
         self.color: Tuple[int, int, int] = color
 
     ## @brief Draw the hole on the screen.
@@ -241,7 +489,9 @@ class Hole:
     #  @param ball The ball object.
     #  @return True if the ball is in the hole, False otherwise.
     def check_ball(self, ball: Ball) -> bool:
-        return (ball.pos - self.pos).length() < self.radius
+        dx: float = ball.x - self.pos.x
+        dy: float = ball.y - self.pos.y
+        return dx * dx + dy * dy < self.r2
 
 ## @brief Class representing the course.
 class Course:
@@ -250,11 +500,22 @@ class Course:
     def __init__(self, data: Dict[str, Any]) -> None:
         self.name: str = data["name"]
         self.polygon: List[pygame.Vector2] = [pygame.Vector2(p) for p in data["polygon"]]
+        self._poly_points_int: List[Tuple[int, int]] = [(int(p.x), int(p.y)) for p in self.polygon]
+        # Polygon edges as arrays (start points, edge vectors, 1 / |edge|^2) for vectorized collision tests.
+        self._p1: np.ndarray = np.asarray(data["polygon"], dtype=float)
+        self._edge: np.ndarray = np.roll(self._p1, -1, axis=0) - self._p1
+        edge_dot: np.ndarray = np.einsum("ij,ij->i", self._edge, self._edge)
+        # Degenerate (zero length) edges get 0, which projects onto their start point.
+        self._inv_edge_dot: np.ndarray = np.divide(1.0, edge_dot, out=np.zeros_like(edge_dot), where=edge_dot > 0)
         self.holes: List[Hole] = [Hole(tuple(h["pos"]), h["radius"], tuple(data["color_holes"])) for h in data["holes"]]
-        self.ball_start: pygame.Vector2 = pygame.Vector2(data["ball_start"])
+        self._hole_xy: np.ndarray = np.array([(h.pos.x, h.pos.y) for h in self.holes], dtype=float).reshape(-1, 2)
+        self._hole_r2: np.ndarray = np.array([h.r2 for h in self.holes], dtype=float)
+        self.ball_start: Tuple[float, float] = (float(data["ball_start"][0]), float(data["ball_start"][1]))
         self.damping: float = data["damping"]
         self.color: Tuple[int, int, int] = tuple(data["color_course"])
         self.colorstroke: Tuple[int, int, int] = tuple(data["color_course_stroke"])
+        self.color_background: Tuple[int, int, int] = tuple(data["color_background"])
+        self._bg: Optional[pygame.Surface] = None
         self.obstacles: List[Obstacle] = [
             obstacle_types[obstacle_data["type"]](
                 tuple(obstacle_data["pos"]),
@@ -265,15 +526,96 @@ class Course:
             for obstacle_data in data["obstacles"]
         ]
 
-    ## @brief Draw the course on the screen.
-    #  @param screen The pygame Surface to draw on.
-    def draw(self, screen: pygame.Surface) -> None:
-        pygame.draw.polygon(screen, self.color, [(p.x, p.y) for p in self.polygon])
-        pygame.draw.polygon(screen, self.colorstroke, [(p.x, p.y) for p in self.polygon], 2)
+        # Broad phase data, built by bind_ball() for the ball's radius. Until then, everything is tested brute force.
+        self._edge_aabb: Optional[np.ndarray] = None
+        self._edge_grid: Optional[SpatialHashGrid] = None
+        self._obstacle_grid: Optional[SpatialHashGrid] = None
+
+    ## @brief Get the polygon edges that may collide with the ball.
+    #  @details Candidates come from the spatial hash grid, those whose bounding box does
+    #           not overlap the ball's travel are then masked out. Small courses without
+    #           a grid, or courses no ball was bound to yet, get all edges.
+    #  @param ball The ball object.
+    #  @return The edge start points, edge vectors and inverse squared edge lengths.
+    def edges_near(self, ball: Ball) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._edge_grid is None:
+            return self._p1, self._edge, self._inv_edge_dot
+        box: AABB = ball.travel_aabb()
+        idx: np.ndarray = np.fromiter(self._edge_grid.query(box), dtype=np.intp)
+        aabb: np.ndarray = self._edge_aabb[idx]
+        idx = idx[(aabb[:, 0] <= box[2]) & (aabb[:, 2] >= box[0]) & (aabb[:, 1] <= box[3]) & (aabb[:, 3] >= box[1])]
+        return self._p1[idx], self._edge[idx], self._inv_edge_dot[idx]
+
+    ## @brief Get the obstacles that may collide with the ball.
+    #  @param ball The ball object.
+    #  @return The obstacles near the ball's travel during the last update.
+    def obstacles_near(self, ball: Ball) -> List[Obstacle]:
+        if self._obstacle_grid is None:
+            return self.obstacles
+        return [self.obstacles[i] for i in sorted(self._obstacle_grid.query(ball.travel_aabb()))]
+
+    ## @brief Find the hole the ball is in.
+    #  @details Courses with many holes test them all in one NumPy pass, otherwise
+    #           the holes are checked one by one, which is cheaper for few holes.
+    #  @param ball The ball object.
+    #  @return The index of the hole the ball is in, or -1 if it is in none.
+    def hole_containing(self, ball: Ball) -> int:
+        if len(self.holes) < HOLE_BATCH_MIN:
+            for i, hole in enumerate(self.holes):
+                if hole.check_ball(ball):
+                    return i
+            return -1
+        d: np.ndarray = self._hole_xy - (ball.x, ball.y)
+        inside: np.ndarray = np.einsum("ij,ij->i", d, d) < self._hole_r2
+        return int(np.argmax(inside)) if inside.any() else -1
+
+    ## @brief Precompute the collision data of the course and all obstacles for a ball.
+    #  @details Hashes edges and obstacles into grids, with their boxes grown by the ball radius.
+    #           The course is static, so this happens only once per ball. Small courses are
+    #           tested brute force.
+    #  @param ball The ball object.
+    def bind_ball(self, ball: Ball) -> None:
+        for obs in self.obstacles:
+            obs.bind_ball(ball)
+
+        r: float = ball.radius
+        # Edge culling only serves the NumPy fallback, the Numba path tests all edges.
+        self._edge_aabb = None
+        self._edge_grid = None
+        if not HAS_NUMBA:
+            # Bounding box (min_x, min_y, max_x, max_y) of each edge.
+            p2: np.ndarray = self._p1 + self._edge
+            self._edge_aabb = np.hstack((np.minimum(self._p1, p2) - r, np.maximum(self._p1, p2) + r))
+            if len(self._p1) >= BROAD_PHASE_MIN_PRIMITIVES:
+                self._edge_grid = SpatialHashGrid.from_aabbs([tuple(b) for b in self._edge_aabb.tolist()])
+        self._obstacle_grid = None
+        if len(self.obstacles) >= BROAD_PHASE_MIN_PRIMITIVES:
+            self._obstacle_grid = SpatialHashGrid.from_aabbs([
+                (b[0] - r, b[1] - r, b[2] + r, b[3] + r)
+                for b in (obs.aabb() for obs in self.obstacles)
+            ])
+
+    ## @brief Render the static course into a background surface.
+    #  @param screen The pygame Surface the background will be blitted to.
+    #  @return The background surface.
+    def _render_background(self, screen: pygame.Surface) -> pygame.Surface:
+        bg: pygame.Surface = pygame.Surface(screen.get_size())
+        bg.fill(self.color_background)
+        pygame.draw.polygon(bg, self.color, self._poly_points_int)
+        pygame.draw.polygon(bg, self.colorstroke, self._poly_points_int, 2)
         for hole in self.holes:
-            hole.draw(screen)
+            hole.draw(bg)
         for obs in self.obstacles:
-            obs.draw(screen)
+            obs.draw(bg)
+        return bg.convert(screen)
+
+    ## @brief Draw the course on the screen, including the background.
+    #  @details The course is static, so it is rendered only once and blitted afterwards.
+    #  @param screen The pygame Surface to draw on.
+    def draw(self, screen: pygame.Surface) -> None:
+        if self._bg is None:
+            self._bg = self._render_background(screen)
+        screen.blit(self._bg, (0, 0))
 
 # Map obstacle type names to their classes.
 obstacle_types: Dict[str, Any] = {
@@ -291,7 +633,8 @@ def main() -> None:
     # Load course data.
     course_data: Dict[str, Any] = load_course_data("course.json")
     course: Course = Course(course_data)
-    ball: Ball = Ball(tuple(course.ball_start), course_data["ball_friction"], course_data["ball_radius"], tuple(course_data["color_ball"]))
+    ball: Ball = Ball(course.ball_start, course_data["ball_friction"], course_data["ball_radius"], tuple(course_data["color_ball"]))
+    course.bind_ball(ball)
 
     # Initialize game data.
     game_data: Dict[str, Any] = {
@@ -303,11 +646,17 @@ def main() -> None:
 
     # Initialize font for on-screen text.
     font: pygame.font.Font = pygame.font.SysFont(None, 24)
+    hud_surface: Optional[pygame.Surface] = None
+    last_game_data: Optional[Dict[str, Any]] = None
 
     aiming: bool = False
     aim_start: pygame.Vector2 = pygame.Vector2(0, 0)
     aim_end: pygame.Vector2 = pygame.Vector2(0, 0)
 
+    accumulator: float = 0.0
+    full_redraw: bool = True
+    dirty_rects: List[pygame.Rect] = []
+
     running: bool = True
     while running:
         dt: float = clock.tick(FPS) / 1000.0
@@ -315,62 +664,83 @@ def main() -> None:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            if event.type == pygame.VIDEOEXPOSE:
+                full_redraw = True
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     aiming = True
-                    aim_start = pygame.Vector2(pygame.mouse.get_pos())
+                    aim_start = pygame.Vector2(event.pos)
+                    aim_end = pygame.Vector2(event.pos)
             if event.type == pygame.MOUSEMOTION:
                 if aiming:
-                    aim_end = pygame.Vector2(pygame.mouse.get_pos())
+                    aim_end = pygame.Vector2(event.pos)
             if event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1 and aiming:
                     aiming = False
-                    aim_release: pygame.Vector2 = pygame.Vector2(pygame.mouse.get_pos())
-                    shoot_vector: pygame.Vector2 = aim_release - ball.pos
-                    strength: float = min(shoot_vector.length() * SHOOT_STRENGTH, MAX_SHOOT_STRENGTH)
-                    if shoot_vector.length() != 0:
-                        ball.velocity = shoot_vector.normalize() * strength
+                    aim_release: pygame.Vector2 = pygame.Vector2(event.pos)
+                    shoot_x: float = aim_release.x - ball.x
+                    shoot_y: float = aim_release.y - ball.y
+                    shoot_length: float = math.hypot(shoot_x, shoot_y)
+                    if shoot_length != 0:
+                        # Scale the shot direction to the shot strength.
+                        scale: float = min(shoot_length * SHOOT_STRENGTH, MAX_SHOOT_STRENGTH) / shoot_length
+                        ball.vx = shoot_x * scale
+                        ball.vy = shoot_y * scale
                         # Update shot counters.
                         game_data["total_shots"] += 1
                         game_data["shots_since_last_hole"] += 1
 
-        ball.update(dt)
+        # Step the physics with a fixed time step, as often as needed to catch up with the frame time.
+        # A ball at rest can neither collide nor drop into a hole, so the physics is skipped for it.
+        if ball.at_rest():
+            accumulator = 0.0
+        else:
+            accumulator = min(accumulator + dt, MAX_PHYS_STEPS * PHYS_DT)
+            while accumulator >= PHYS_DT and not ball.at_rest():
+                accumulator -= PHYS_DT
+                ball.update(PHYS_DT)
+
+                for obs in course.obstacles_near(ball):
+                    obs.collide(ball, PHYS_DT)
+
+                # Check and handle collisions with the course polygon edges.
+                handle_polygon_collision(ball, course, course.damping)
+
+                if course.hole_containing(ball) >= 0:
+                    print("Ball in hole!")
+                    # Record shots needed for this hole.
+                    game_data["shots_needed_last_hole"] = game_data["shots_since_last_hole"]
+                    # Reset shots for the current hole.
+                    game_data["shots_since_last_hole"] = 0
+                    ball.x, ball.y = course.ball_start
+                    ball.vx = ball.vy = 0.0
 
-        for obs in course.obstacles:
-            obs.collide(ball, dt)
-
-        # Check and handle collisions with the course polygon edges.
-        handle_polygon_collision(ball, course.polygon, course.damping)
-
-        for hole in course.holes:
-            if hole.check_ball(ball):
-                print("Ball in hole!")
-                # Record shots needed for this hole.
-                game_data["shots_needed_last_hole"] = game_data["shots_since_last_hole"]
-                # Reset shots for the current hole.
-                game_data["shots_since_last_hole"] = 0
-                ball.pos = pygame.Vector2(course.ball_start)
-                ball.velocity = pygame.Vector2(0, 0)
-
-        screen.fill(tuple(course_data["color_background"]))
         course.draw(screen)
-        ball.draw(screen)
+        drawn_rects: List[pygame.Rect] = [ball.draw(screen)]
 
         if aiming:
-            pygame.draw.line(screen, COLOR_AIMLINE, (ball.pos.x, ball.pos.y), pygame.mouse.get_pos(), 2)
-
-        # Render game data on screen.
-        info_text: str = (
-            f"{game_data['course_name']}\n\n"
-            f"Total Shots: {game_data['total_shots']}\n"
-            f"Current Hole Shots: {game_data['shots_since_last_hole']}\n"
-            f"Last Hole: {game_data['shots_needed_last_hole']}"
-        )
-        text_surface: pygame.Surface = font.render(info_text, True, (255, 255, 255))
-        screen.blit(text_surface, (10, 10))
-
-        pygame.display.flip()
+            drawn_rects.append(pygame.draw.line(screen, COLOR_AIMLINE, (ball.x, ball.y), aim_end, 2))
+
+        # Render game data on screen, only re-rendering the text when it has changed.
+        if game_data != last_game_data:
+            info_text: str = (
+                f"{game_data['course_name']}\n\n"
+                f"Total Shots: {game_data['total_shots']}\n"
+                f"Current Hole Shots: {game_data['shots_since_last_hole']}\n"
+                f"Last Hole: {game_data['shots_needed_last_hole']}"
+            )
+            hud_surface = render_text_lines(font, info_text, COLOR_HUD)
+            last_game_data = dict(game_data)
+        drawn_rects.append(screen.blit(hud_surface, (10, 10)))
+
+        # Only update the screen areas that were drawn to in this or the previous frame.
+        if full_redraw:
+            pygame.display.flip()
+            full_redraw = False
+        else:
+            pygame.display.update(dirty_rects + drawn_rects)
+        dirty_rects = drawn_rects
 
     pygame.quit()
 